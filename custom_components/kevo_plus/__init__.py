@@ -3,42 +3,48 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import logging
 import uuid
-import ssl
-from datetime import timedelta
+from collections.abc import Callable
+import time
 
 # Updated import: use our local vendored copy.
 from custom_components.kevo_plus.aiokevoplus import KevoApi, KevoLock, KevoError, KevoAuthError
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, EVENT_HOMEASSISTANT_STOP, Platform
-from homeassistant.core import Event, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import CONF_LOCKS, DOMAIN
+from homeassistant.util.ssl import get_default_context
+from .const import (
+    CONF_LOCKS,
+    DOMAIN,
+    REQUEST_REFRESH_DELAY,
+    UPDATE_INTERVAL,
+    WEBSOCKET_UPDATE_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.LOCK, Platform.SENSOR]
 
+@functools.lru_cache(maxsize=8)
+def derive_device_id(password: str) -> uuid.UUID:
+    """Derive the stable device id presented to the Kevo service."""
+    digest = hashlib.md5(password.encode(), usedforsecurity=False).digest()
+    return uuid.UUID(bytes=digest)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Kevo Plus from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     password = entry.data.get(CONF_PASSWORD)
-    device_id = uuid.UUID(bytes=hashlib.md5(password.encode()).digest())
-
-    def create_api_client():
-        """Create API client with SSL context in executor."""
-        ssl_context = ssl.create_default_context()
-        return KevoApi(device_id, ssl_context=ssl_context)
-
-    client = await hass.async_add_executor_job(create_api_client)
+    device_id = derive_device_id(password)
+    client = KevoApi(device_id, ssl_context=get_default_context())
     try:
-        # Offload blocking login call.
-        await hass.async_add_executor_job(
-            client.login, entry.data.get(CONF_USERNAME), password
-        )
+        await client.login(entry.data.get(CONF_USERNAME), password)
     except KevoAuthError as auth_ex:
         raise ConfigEntryAuthFailed("Invalid credentials") from auth_ex
     except KevoError as ex:
@@ -54,6 +60,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if locks:
+        entry.async_on_unload(client.register_callback(coordinator.async_handle_push))
+        entry.async_on_unload(
+            client.register_connection_callback(coordinator.async_handle_connection)
+        )
+        await client.websocket_connect()
+
     async def _async_disconnect(event: Event) -> None:
         """Disconnect from Websocket."""
         await client.websocket_close()
@@ -87,22 +100,41 @@ class KevoCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name="Kevo",
-            update_interval=timedelta(seconds=30),
+            update_interval=UPDATE_INTERVAL,
+            # Coalesce refreshes requested by bursts of lock/unlock commands.
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REQUEST_REFRESH_DELAY, immediate=False
+            ),
         )
         self.api = api
         self.entry = entry
         self._selected_locks = locks
+        self._selected_locks_set = frozenset(locks or ())
         self._devices = {}
+        self._listeners_by_id: dict[str, list[Callable[[], None]]] = {}
+        self._websocket_was_connected = False
+        self._catch_up_at = 0.0
 
     async def _async_update_data(self):
         """Update data via library."""
+        if not self._selected_locks:
+            return {}
         try:
-            all_devices = await self.hass.async_add_executor_job(self.api.get_locks)
-            self._devices = {
-                device.lock_id: device
-                for device in all_devices
-                if device.lock_id in self._selected_locks
-            }
+            all_devices = await self.api.get_locks(only=self._selected_locks_set)
+            # The api updates known locks in place, so only additions and
+            # removals need to be applied to the existing mapping.
+            for device in all_devices:
+                self._devices.setdefault(device.lock_id, device)
+            if len(self._devices) != len(all_devices):
+                current = {device.lock_id for device in all_devices}
+                for lock_id in self._devices.keys() - current:
+                    del self._devices[lock_id]
+            # Pushed updates make frequent polling redundant while the websocket is up.
+            self.update_interval = (
+                WEBSOCKET_UPDATE_INTERVAL
+                if self.api.websocket_connected
+                else UPDATE_INTERVAL
+            )
             return self._devices
         except KevoAuthError:
             await self.entry.async_start_reauth(self.hass)
@@ -111,8 +143,51 @@ class KevoCoordinator(DataUpdateCoordinator):
             _LOGGER.error(f"Error updating Kevo locks: {e}")
             raise ConfigEntryNotReady(f"Error communicating with API: {e}")
 
+    @callback
+    def register_for(
+        self, lock_id: str, update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for websocket updates to a single lock."""
+        listeners = self._listeners_by_id.setdefault(lock_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_handle_push(self, lock: KevoLock) -> None:
+        """Notify the listeners of a lock updated over the websocket."""
+        for update_callback in list(self._listeners_by_id.get(lock.lock_id, ())):
+            update_callback()
+
+    @callback
+    def async_handle_connection(self, connected: bool) -> None:
+        """Adjust polling when the websocket connects or drops."""
+        if connected:
+            self.update_interval = WEBSOCKET_UPDATE_INTERVAL
+            if not self._websocket_was_connected:
+                self._websocket_was_connected = True
+                return
+        else:
+            # Without pushes, fall back to regular polling straight away.
+            self.update_interval = UPDATE_INTERVAL
+        # Catch up on anything missed while the websocket was down, at most
+        # once per poll interval so a flapping connection doesn't flood the API.
+        now = time.monotonic()
+        if now - self._catch_up_at < UPDATE_INTERVAL.total_seconds():
+            return
+        self._catch_up_at = now
+        self.hass.async_create_task(self.async_request_refresh())
+
     async def get_devices(self) -> list:
         """Retrieve the devices associated with the coordinator."""
-        if not self._devices:
+        if not self._devices and self._selected_locks:
             await self.async_refresh()
-        return list(self._devices.values())
\ No newline at end of file
+        return list(self._devices.values())
+
+    async def get_lock_names(self) -> dict[str, str]:
+        """Retrieve a mapping of lock id to name."""
+        return {device.lock_id: device.name for device in await self.get_devices()}
\ No newline at end of file
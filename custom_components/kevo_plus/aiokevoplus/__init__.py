@@ -5,12 +5,11 @@ import hmac
 import html
 import json
 import logging
-import math
-import os
 import random
 import re
 import secrets
 import ssl
+import struct
 import time
 from typing import Callable
 import uuid
@@ -20,6 +19,13 @@ import jwt
 import pkce
 import websockets
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 _LOGGER = logging.getLogger(__name__)
 
 from aiokevoplus.const import (
@@ -42,6 +48,42 @@ from aiokevoplus.const import (
 )
 
 
+_CLIENT_SECRET_BYTES = base64.b64decode(CLIENT_SECRET)
+_VERIFICATION_HMAC = hmac.new(_CLIENT_SECRET_BYTES, b"", hashlib.sha512)
+
+# Bolt state -> (is_locked, is_jammed); None leaves is_locked unchanged.
+_BOLT_STATES: dict[int, tuple[bool | None, bool]] = {
+    LOCK_STATE_LOCK: (True, False),
+    LOCK_STATE_UNLOCK: (False, False),
+    LOCK_STATE_JAM: (None, True),
+    LOCK_STATE_LOCK_JAM: (True, True),
+    LOCK_STATE_UNLOCK_JAM: (False, True),
+}
+
+_REQUEST_VERIFICATION_TOKEN_RE = re.compile(
+    r'<input name="__RequestVerificationToken" [^>]+ value="([^"]+)"'
+)
+_SERIALIZED_CLIENT_RE = re.compile(
+    r'<input [^>]+ name="SerializedClient" value="([^"]+)"'
+)
+
+_shared_transports: dict[ssl.SSLContext | None, httpx.AsyncHTTPTransport] = {}
+
+
+def _get_shared_transport(
+    ssl_context: ssl.SSLContext = None,
+) -> httpx.AsyncHTTPTransport:
+    """Retrieve the connection pool shared by api instances using ssl_context."""
+    transport = _shared_transports.get(ssl_context)
+    if transport is None:
+        # A ready-made context spares the transport from loading the CA bundle.
+        transport = _shared_transports[ssl_context] = httpx.AsyncHTTPTransport(
+            verify=ssl_context if ssl_context is not None else True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+    return transport
+
+
 class KevoError(Exception):
     pass
 
@@ -56,118 +98,76 @@ class KevoPermissionError(KevoError):
 
 class KevoApi:
     MAX_RECONNECT_DELAY: int = 240
+    STABLE_CONNECTION_TIME: int = 60
 
     def __init__(self, device_id: uuid.UUID = None, client: httpx.AsyncClient = None, ssl_context: ssl.SSLContext = None):
         self._expires_at = 0
         self._refresh_token: str = None
         self._id_token: str = None
         self._access_token: str = None
+        self._base_headers: dict[str, str] = {}
         self._user_id: str = None
+        self._user_locks_url: str = None
         self._device_id = device_id
         self._websocket_task: asyncio.Task = None
         self._callbacks: list[Callable] = []
+        self._connection_callbacks: list[Callable] = []
+        self._devices: dict[str, KevoLock] = {}
         self._websocket = None
+        self._ws_connected = False
         self._disconnecting = False
+        self._refresh_lock = asyncio.Lock()
         self._client = client
         self._ssl_context = ssl_context
-        if self._ssl_context is None:
-            self._ssl_context = ssl.create_default_context()
 
         if self._client is None:
-            self._client = httpx.AsyncClient()
+            # Each instance keeps its own cookie jar for the login redirects, while
+            # connections are pooled per SSL context. The client is never closed
+            # since that would close the shared transport.
+            self._client = httpx.AsyncClient(
+                transport=_get_shared_transport(self._ssl_context),
+                timeout=httpx.Timeout(10.0),
+            )
 
         if self._device_id is None:
             self._device_id = uuid.uuid4()
 
     def __generate_websocket_verification(self, cnonce: str, snonce: str) -> str:
         """Generate the verification value used to connect to the websocket."""
-        snonce_bytes = base64.b64decode(snonce)
-        cnonce_bytes = base64.b64decode(cnonce)
-        secret_bytes = base64.b64decode(CLIENT_SECRET)
-
-        total_bytes = snonce_bytes
-        total_bytes += cnonce_bytes
-        sign = hmac.new(secret_bytes, total_bytes, hashlib.sha512).digest()
-
-        return base64.b64encode(sign).decode()
+        mac = _VERIFICATION_HMAC.copy()
+        mac.update(base64.b64decode(snonce))
+        mac.update(base64.b64decode(cnonce))
+        return base64.b64encode(mac.digest()).decode()
 
     def __generate_certificate(self) -> str:
         """Generate a device certificate."""
 
-        def int_val(byte_val: int) -> list:
-            e = []
-            r = 0
-            while True:
-                e.append(255 & byte_val)
-                byte_val >>= 8
-                r += 1
-                if r >= 4:
-                    break
-            return e
-
-        def short_val(byte_val: int) -> list:
-            e = []
-            r = 0
-            while True:
-                e.append(255 & byte_val)
-                byte_val >>= 8
-                r += 1
-                if r >= 2:
-                    break
-            return e
-
-        def random_bytes(byte_val: int) -> list:
-            e = []
-            for _ in range(byte_val):
-                e.append(math.floor(255 * random.random()))
-            return e
-
-        def uuid_to_bytes(guid: str) -> list:
-            guid_parts = guid.split("-")
-            result_list = []
-
-            def map_the_thing(element, index):
-                list_of_parts = None
-                if index < 3:
-                    list_of_parts = list(reversed(re.findall(".{1,2}", element)))
-                else:
-                    list_of_parts = re.findall(".{1,2}", element)
-
-                [result_list.append(int(element, 16)) for element in list_of_parts]
-
-            [map_the_thing(element, index) for index, element in enumerate(guid_parts)]
-            return list(reversed(result_list))
-
-        def length_encoded_bytes(byte_val, byte_array) -> list:
-            result = [byte_val]
-            result.extend(short_val(len(byte_array)))
-            result.extend(byte_array)
-            return result
-
-        e = int(time.time())
-        s = [17, 1, 0, 1, 19, 1, 0, 1, 16, 1, 0, 48]
-        s.extend(length_encoded_bytes(18, int_val(1)))
-        s.extend(length_encoded_bytes(20, int_val(e)))
-        s.extend(length_encoded_bytes(21, int_val(e)))
-        s.extend(length_encoded_bytes(22, int_val(e + 86400)))
-        s.extend([48, 1, 0, 6])
-        s.extend(
-            length_encoded_bytes(
-                49, uuid_to_bytes("00000000-0000-0000-0000-000000000000")
-            )
-        )
-        s.extend(length_encoded_bytes(50, uuid_to_bytes(str(self._device_id))))
-        s.extend(length_encoded_bytes(53, random_bytes(32)))
-        s.extend(length_encoded_bytes(54, random_bytes(32)))
-        result = base64.b64encode(bytearray(s)).decode()
-        return result
+        def length_encoded_bytes(tag: int, value: bytes) -> bytes:
+            return struct.pack("<BH", tag, len(value)) + value
+
+        def guid_bytes(guid: uuid.UUID) -> bytes:
+            # GUIDs are sent as the reverse of their little-endian byte layout.
+            return guid.bytes_le[::-1]
+
+        now = int(time.time())
+        cert = bytearray([17, 1, 0, 1, 19, 1, 0, 1, 16, 1, 0, 48])
+        cert += length_encoded_bytes(18, struct.pack("<I", 1))
+        cert += length_encoded_bytes(20, struct.pack("<I", now))
+        cert += length_encoded_bytes(21, struct.pack("<I", now))
+        cert += length_encoded_bytes(22, struct.pack("<I", now + 86400))
+        cert += bytes([48, 1, 0, 6])
+        cert += length_encoded_bytes(49, guid_bytes(uuid.UUID(int=0)))
+        cert += length_encoded_bytes(50, guid_bytes(self._device_id))
+        cert += length_encoded_bytes(53, secrets.token_bytes(32))
+        cert += length_encoded_bytes(54, secrets.token_bytes(32))
+        return base64.b64encode(cert).decode()
 
     async def __get_server_nonce(self) -> str:
         """Retrieve a server nonce."""
         client = self._client
-        client.headers = {"Content-Type": "application/json"}
         res = await client.post(
             UNIKEY_API_URL_BASE + "/api/v2/nonces",
+            headers={"Content-Type": "application/json"},
             json={"headers": {"Accept": "application/json"}},
         )
         res.raise_for_status()
@@ -180,19 +180,23 @@ class KevoApi:
 
     async def __get_headers(self) -> dict:
         """Retrieve the headers needed to make api calls."""
-        cnonce = self.__get_client_nonce()
-        snonce = await self.__get_server_nonce()
+        headers = self._base_headers.copy()
+        headers["X-unikey-cnonce"] = self.__get_client_nonce()
+        headers["X-unikey-nonce"] = await self.__get_server_nonce()
+        return headers
 
-        headers = {
-            "X-unikey-cnonce": cnonce,
+    def __store_tokens(self, json_response: dict) -> None:
+        """Store the tokens from a token response and the headers derived from them."""
+        self._access_token = json_response["access_token"]
+        self._id_token = json_response["id_token"]
+        self._refresh_token = json_response["refresh_token"]
+        self._expires_at = time.time() + json_response["expires_in"]
+        self._base_headers = {
             "X-unikey-context": "Web",
-            "X-unikey-nonce": snonce,
             "Authorization": "Bearer " + self._access_token,
             "Accept": "application/json",
         }
 
-        return headers
-
     async def async_refresh_token(self) -> None:
         """Refresh the access token."""
         client = self._client
@@ -206,111 +210,84 @@ class KevoApi:
             UNIKEY_LOGIN_URL_BASE + "/connect/token", data=post_params
         )
         res.raise_for_status()
-        json_response = res.json()
-        self._access_token = json_response["access_token"]
-        self._id_token = json_response["id_token"]
-        self._refresh_token = json_response["refresh_token"]
-        self._expires_at = time.time() + json_response["expires_in"]
-
-    async def _api_post(self, url: str, body: dict):
-        """POST to the API."""
-        client = self._client
-
-        # Reauth if needed
-        if self._expires_at < time.time() + 100:
-            await self.async_refresh_token()
-
-        headers = await self.__get_headers()
+        self.__store_tokens(res.json())
 
-        res = await client.post(
-            UNIKEY_API_URL_BASE + url,
-            headers=headers,
-            json=body,
-        )
-        try:
-            res.raise_for_status()
-        except httpx.HTTPStatusError as ex:
-            if ex.response.status_code == 403:
+    async def __refresh_token_once(self, stale_token: str) -> None:
+        """Refresh the access token unless another caller already replaced stale_token."""
+        async with self._refresh_lock:
+            if self._access_token == stale_token:
                 await self.async_refresh_token()
-                headers = await self.__get_headers()
-                res = await client.post(
-                    UNIKEY_API_URL_BASE + url,
-                    headers=headers,
-                    json=body,
-                )
-                try:
-                    res.raise_for_status()
-                except httpx.HTTPStatusError as retryex:
-                    if retryex.response.status_code == 403:
-                        raise KevoAuthError()
-                    else:
-                        raise
-            elif ex.response.status_code == 401:
-                raise KevoPermissionError()
-            else:
-                raise
-        return res.json()
 
-    async def get_locks(self) -> list["KevoLock"]:
-        """Retrieve the list of available locks."""
+    async def _request(self, method: str, url: str, *, json: dict = None) -> httpx.Response:
+        """Send a request to the API, reauthenticating once if the token is rejected."""
         client = self._client
-        headers = await self.__get_headers()
 
         # Reauth if needed
         if self._expires_at < time.time() + 100:
-            await self.async_refresh_token()
+            await self.__refresh_token_once(self._access_token)
 
-        res = await client.get(
-            UNIKEY_API_URL_BASE + "/api/v2/users/" + self._user_id + "/locks",
-            headers=headers,
+        token = self._access_token
+        headers = await self.__get_headers()
+        res = await client.request(
+            method, UNIKEY_API_URL_BASE + url, headers=headers, json=json
         )
-        try:
-            res.raise_for_status()
-        except httpx.HTTPStatusError as ex:
-            if ex.response.status_code == 403:
-                await self.async_refresh_token()
-                headers = await self.__get_headers()
-                res = await client.get(
-                    UNIKEY_API_URL_BASE + "/api/v2/users/" + self._user_id + "/locks",
-                    headers=headers,
-                )
-                try:
-                    res.raise_for_status()
-                except httpx.HTTPStatusError as retryex:
-                    if retryex.response.status_code == 403:
-                        raise KevoAuthError()
-                    else:
-                        raise
+        if res.status_code == 403:
+            await self.__refresh_token_once(token)
+            headers = await self.__get_headers()
+            res = await client.request(
+                method, UNIKEY_API_URL_BASE + url, headers=headers, json=json
+            )
+            if res.status_code == 403:
                 raise KevoAuthError()
-            elif ex.response.status_code == 401:
-                raise KevoPermissionError()
-            else:
-                raise
+        if res.status_code == 401:
+            raise KevoPermissionError()
+        res.raise_for_status()
+        return res
+
+    async def _api_post(self, url: str, body: dict):
+        """POST to the API."""
+        return (await self._request("POST", url, json=body)).json()
+
+    async def get_locks(self, only: set[str] | None = None) -> list["KevoLock"]:
+        """Retrieve the list of available locks, optionally limited to the given ids."""
+        res = await self._request("GET", self._user_locks_url)
         json_response = res.json()
         lock_response = json_response["locks"]
-        self._devices = []
+        devices: dict[str, KevoLock] = {}
 
         for lock in lock_response:
-            self._devices.append(
-                KevoLock(
+            lock_id = lock["id"]
+            if only is not None and lock_id not in only:
+                continue
+            device = self._devices.get(lock_id)
+            if device is None:
+                device = KevoLock(
                     self,
-                    lock["id"],
+                    lock_id,
                     lock["name"],
                     lock["firmwareVersion"],
                     lock["batteryLevel"],
                     lock["boltState"],
                     lock["brand"],
                 )
-            )
-        return self._devices
+            else:
+                device._update(
+                    lock["name"],
+                    lock["firmwareVersion"],
+                    lock["batteryLevel"],
+                    lock["boltState"],
+                    lock["brand"],
+                )
+            devices[lock_id] = device
+        self._devices = devices
+        return list(devices.values())
 
     async def login(self, username: str, password: str) -> None:
         """Login to the API."""
         client = self._client
         code_verifier, code_challenge = pkce.generate_pkce_pair()
         certificate = self.__generate_certificate()
-        md5hash = hashlib.md5(os.urandom(32))
-        state = md5hash.hexdigest()
+        state = secrets.token_hex(16)
         res = await client.get(
             UNIKEY_INVALID_LOGIN_URL,
             params={
@@ -334,19 +311,11 @@ class KevoApi:
             res = await client.get(redirect_location)
             res.raise_for_status()
             body_text = res.text
-            request_verification_token = next(
-                re.finditer(
-                    '<input name="__RequestVerificationToken" .+ value="(.+?)"',
-                    body_text,
-                )
+            request_verification_token = _REQUEST_VERIFICATION_TOKEN_RE.search(
+                body_text
             ).group(1)
             serialized_client = html.unescape(
-                next(
-                    re.finditer(
-                        '<input .+ name="SerializedClient" value="(.+?)"',
-                        body_text,
-                    )
-                ).group(1)
+                _SERIALIZED_CLIENT_RE.search(body_text).group(1)
             )
             client.cookies = res.cookies
 
@@ -388,15 +357,12 @@ class KevoApi:
                         UNIKEY_LOGIN_URL_BASE + "/connect/token", data=post_params
                     )
                     res.raise_for_status()
-                    json_response = res.json()
-                    self._access_token = json_response["access_token"]
-                    self._id_token = json_response["id_token"]
-                    self._refresh_token = json_response["refresh_token"]
-                    self._expires_at = time.time() + json_response["expires_in"]
+                    self.__store_tokens(res.json())
                     jwt_value = jwt.decode(
                         self._id_token, options={"verify_signature": False}
                     )
                     self._user_id = jwt_value["sub"]
+                    self._user_locks_url = f"/api/v2/users/{self._user_id}/locks"
                 else:
                     res.raise_for_status()
             else:
@@ -404,124 +370,154 @@ class KevoApi:
         else:
             res.raise_for_status()
 
-    def __process_message(self, message: str) -> None:
+    def __process_message(self, message: bytes | str) -> None:
         """Process a websocket message."""
         try:
-            json_body = json.loads(message)
-            if json_body["messageType"] == "LockStatus":
-                message_body = json_body["messageData"]
-                lock_id = message_body["lockId"]
-
-                lock = next((x for x in self._devices if x.lock_id == lock_id))
-
-                if lock is not None:
-                    lock.battery_level = message_body["batteryLevel"]
-                    boltState = message_body["boltState"]
-                    command = message_body["command"]
-                    command_status = None
-                    if command is not None:
-                        command_status = command["status"]
-                    if boltState == LOCK_STATE_LOCK:
-                        lock.is_locked = True
-                        lock.is_jammed = False
-                    elif boltState == LOCK_STATE_UNLOCK:
-                        lock.is_locked = False
-                        lock.is_jammed = False
-                    elif boltState == LOCK_STATE_JAM:
-                        lock.is_jammed = True
-                    elif boltState == LOCK_STATE_LOCK_JAM:
-                        lock.is_jammed = True
-                        lock.is_locked = True
-                    elif boltState == LOCK_STATE_UNLOCK_JAM:
-                        lock.is_jammed = True
-                        lock.is_locked = False
+            json_body = _json_loads(message)
+            if json_body.get("messageType") != "LockStatus":
+                return
+            message_body = json_body["messageData"]
+            lock = self._devices.get(message_body["lockId"])
+            if lock is None:
+                return
+
+            lock.battery_level = message_body["batteryLevel"]
+            boltState = message_body["boltState"]
+            command = message_body["command"]
+            command_status = None
+            if command is not None:
+                command_status = command["status"]
+            bolt_state = _BOLT_STATES.get(boltState)
+            if bolt_state is None:
+                _LOGGER.warning("Unknown lock state %s", boltState)
+                lock.is_jammed = None
+                lock.is_locked = None
+            else:
+                is_locked, lock.is_jammed = bolt_state
+                if is_locked is not None:
+                    lock.is_locked = is_locked
+
+            if command_status is not None:
+                if command_status in (
+                    COMMAND_STATUS_COMPLETE,
+                    COMMAND_STATUS_CANCELLED,
+                ):
+                    lock.is_locking = False
+                    lock.is_unlocking = False
+                elif command_status in (
+                    COMMAND_STATUS_PROCESSING,
+                    COMMAND_STATUS_DELIVERED,
+                ):
+                    if command["type"] == LOCK_STATE_LOCK:
+                        lock.is_locking = True
+                        lock.is_unlocking = False
                     else:
-                        _LOGGER.warn("Unknown lock state %s", boltState)
-                        lock.is_jammed = None
-                        lock.is_locked = None
-
-                    if command_status is not None:
-                        if command_status in (
-                            COMMAND_STATUS_COMPLETE,
-                            COMMAND_STATUS_CANCELLED,
-                        ):
-                            lock.is_locking = False
-                            lock.is_unlocking = False
-                        elif command_status in (
-                            COMMAND_STATUS_PROCESSING,
-                            COMMAND_STATUS_DELIVERED,
-                        ):
-                            if command["type"] == LOCK_STATE_LOCK:
-                                lock.is_locking = True
-                                lock.is_unlocking = False
-                            else:
-                                lock.is_locking = False
-                                lock.is_unlocking = True
-                    for callback in self._callbacks:
-                        try:
-                            callback(lock)
-                        except Exception as err:
-                            _LOGGER.error("Callback error: %s", err)
+                        lock.is_locking = False
+                        lock.is_unlocking = True
+            for callback in self._callbacks:
+                try:
+                    callback(lock)
+                except Exception as err:
+                    _LOGGER.error("Callback error: %s", err)
         except Exception as ex:
             _LOGGER.error("Exception occurred reading websocket message: %s", ex)
 
-    async def __websocket_reconnect(self) -> None:
-        """Reconnect to the websocket if an error occurs."""
+    async def __websocket_backoff(self) -> None:
+        """Wait before reconnecting, backing off exponentially with jitter."""
         self._reconnect_attempts += 1
-        reconnect_delay = 2**self._reconnect_attempts
-        if reconnect_delay > self.MAX_RECONNECT_DELAY:
-            reconnect_delay = self.MAX_RECONNECT_DELAY
-        await asyncio.sleep(reconnect_delay)
-        self._websocket_task = asyncio.create_task(self.__websocket_connect())
+        attempts = min(self._reconnect_attempts, 8)
+        reconnect_delay = min(self.MAX_RECONNECT_DELAY, 1 << attempts)
+        # Jitter keeps clients from reconnecting in lockstep after an outage.
+        await asyncio.sleep(reconnect_delay * (0.5 + random.random() * 0.5))
+
+    def __notify_connection(self, connected: bool) -> None:
+        """Tell the connection callbacks that the websocket connected or dropped."""
+        for callback in self._connection_callbacks:
+            try:
+                callback(connected)
+            except Exception as err:
+                _LOGGER.error("Connection callback error: %s", err)
 
     async def websocket_close(self) -> None:
         """Close the connection to the websocket."""
         self._disconnecting = True
+        self._ws_connected = False
         if self._websocket is not None:
             await self._websocket.close()
         if self._websocket_task is not None:
             self._websocket_task.cancel()
 
     async def __websocket_connect(self) -> None:
-        """Connect to the websocket."""
-        auth_token = quote(f"Bearer {self._access_token}", safe="!~*'()")
-        cnonce = self.__get_client_nonce()
-        snonce = None
-        try:
-            snonce = await self.__get_server_nonce()
-        except httpx.HTTPStatusError as ex:
-            raise
-        except:
-            _LOGGER.error("Failed to retrieve server nonce, retrying")
-            await self.__websocket_reconnect()
-            return
-
-        verification = quote(
-            self.__generate_websocket_verification(cnonce, snonce), safe="!~*'()"
-        )
-        cnonce = quote(cnonce, safe="!~*'()")
-        snonce = quote(snonce, safe="!~*'()")
-        query_string = f"?Authorization={auth_token}&X-unikey-context=web&X-unikey-cnonce={cnonce}&X-unikey-nonce={snonce}&X-unikey-request-verification={verification}&X-unikey-message-content-type=application%2Fjson&"
-        async for websocket in websockets.connect(
-            UNIKEY_WS_URL_BASE + "/v3/web/" + self._user_id + query_string,
-            ping_interval=10,
-            user_agent_header="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36",
-            ssl=self._ssl_context
-        ):
-            self._reconnect_attempts = 0
-            self._websocket = websocket
+        """Connect to the websocket, reconnecting until it is closed."""
+        while not self._disconnecting:
+            try:
+                # The socket can stay up longer than the token lives, so a
+                # reconnect must not reuse an expired token.
+                if self._expires_at < time.time() + 100:
+                    await self.__refresh_token_once(self._access_token)
+                snonce = await self.__get_server_nonce()
+            except Exception as ex:
+                # Outages surface as 5xx/429 responses; keep retrying so pushes
+                # resume once the service recovers.
+                _LOGGER.error("Failed to prepare websocket connection, %s, retrying", ex)
+                await self.__websocket_backoff()
+                continue
+
+            auth_token = quote(f"Bearer {self._access_token}", safe="!~*'()")
+            cnonce = self.__get_client_nonce()
+
+            verification = quote(
+                self.__generate_websocket_verification(cnonce, snonce), safe="!~*'()"
+            )
+            cnonce = quote(cnonce, safe="!~*'()")
+            snonce = quote(snonce, safe="!~*'()")
+            if self._ssl_context is None:
+                # Loading the CA bundle reads from disk, keep it off the event loop.
+                self._ssl_context = await asyncio.get_running_loop().run_in_executor(
+                    None, ssl.create_default_context
+                )
+            query_string = f"?Authorization={auth_token}&X-unikey-context=web&X-unikey-cnonce={cnonce}&X-unikey-nonce={snonce}&X-unikey-request-verification={verification}&X-unikey-message-content-type=application%2Fjson&"
+            connected_at = None
             try:
-                async for message in websocket:
-                    self.__process_message(message)
+                async with websockets.connect(
+                    UNIKEY_WS_URL_BASE + "/v3/web/" + self._user_id + query_string,
+                    ping_interval=10,
+                    max_size=65536,
+                    max_queue=32,
+                    compression=None,
+                    user_agent_header="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36",
+                    ssl=self._ssl_context
+                ) as websocket:
+                    connected_at = time.monotonic()
+                    self._websocket = websocket
+                    self._ws_connected = True
+                    self.__notify_connection(True)
+                    async for message in websocket:
+                        self.__process_message(message)
             except websockets.ConnectionClosed:
                 if not self._disconnecting:
                     _LOGGER.error("Lost connection to websocket, retrying")
-                    await self.__websocket_reconnect()
-                return
             except Exception as ex:
                 _LOGGER.error("Error on websocket, %s, retrying", ex)
-                await self.__websocket_reconnect()
-                return
+            finally:
+                if self._ws_connected and not self._disconnecting:
+                    self.__notify_connection(False)
+                self._ws_connected = False
+                # Only a connection that stayed up resets the backoff, so a
+                # server closing right after the handshake is not hammered.
+                if (
+                    connected_at is not None
+                    and time.monotonic() - connected_at >= self.STABLE_CONNECTION_TIME
+                ):
+                    self._reconnect_attempts = 0
+
+            if not self._disconnecting:
+                await self.__websocket_backoff()
+
+    @property
+    def websocket_connected(self) -> bool:
+        """Retrieve whether the websocket is currently connected."""
+        return self._ws_connected
 
     async def websocket_connect(self) -> asyncio.Task:
         """Connect to the websocket via a task."""
@@ -541,12 +537,35 @@ class KevoApi:
         self._callbacks.append(callback)
         return unregister_callback
 
+    def register_connection_callback(self, callback: Callable) -> Callable:
+        """Add a callback to be triggered when the websocket connects or drops."""
+
+        def unregister_connection_callback() -> None:
+            self._connection_callbacks.remove(callback)
+
+        self._connection_callbacks.append(callback)
+        return unregister_connection_callback
+
     def unregister_callback(self, callback: Callable) -> None:
         """Remove a callback that gets triggered when an event is received."""
         self._callbacks.remove(callback)
 
 
 class KevoLock:
+    __slots__ = (
+        "_api",
+        "_battery_level",
+        "_brand",
+        "_commands_url",
+        "_firmware",
+        "_is_jammed",
+        "_is_locked",
+        "_is_locking",
+        "_is_unlocking",
+        "_lock_id",
+        "_name",
+    )
+
     def __init__(
         self,
         api: KevoApi,
@@ -559,11 +578,23 @@ class KevoLock:
     ):
         self._api = api
         self._lock_id = lock_id
+        self._commands_url = f"{api._user_locks_url}/{lock_id}/commands"
+        self._is_locking = False
+        self._is_unlocking = False
+        self._update(name, firmware, battery_level, state, brand)
+
+    def _update(
+        self,
+        name: str,
+        firmware: str,
+        battery_level: float,
+        state: str,
+        brand: str,
+    ) -> None:
+        """Update the lock from an api response."""
         self._name = name
         self._firmware = firmware
         self._battery_level = battery_level
-        self._is_locking = False
-        self._is_unlocking = False
         if state in ("Locked", "LockedBoltJam"):
             self._is_locked = True
         else:
@@ -662,21 +693,11 @@ class KevoLock:
     async def lock(self):
         """Lock the lock."""
         return await self._api._api_post(
-            "/api/v2/users/"
-            + self._api._user_id
-            + "/locks/"
-            + self._lock_id
-            + "/commands",
-            {"command": LOCK_STATE_LOCK},
+            self._commands_url, {"command": LOCK_STATE_LOCK}
         )
 
     async def unlock(self):
         """Unlock the lock."""
         return await self._api._api_post(
-            "/api/v2/users/"
-            + self._api._user_id
-            + "/locks/"
-            + self._lock_id
-            + "/commands",
-            {"command": LOCK_STATE_UNLOCK},
+            self._commands_url, {"command": LOCK_STATE_UNLOCK}
         )
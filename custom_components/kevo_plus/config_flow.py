@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import functools
 import logging
-import uuid
-import ssl
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
+import httpx
 import voluptuous as vol
 from custom_components.kevo_plus.aiokevoplus import KevoApi, KevoAuthError, KevoError
 
@@ -16,7 +16,8 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.ssl import get_default_context
+from . import derive_device_id
 from .const import CONF_LOCKS, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,6 +26,18 @@ STEP_USER_DATA_SCHEMA = vol.Schema({
     vol.Required(CONF_PASSWORD): str,
 })
 
+@functools.lru_cache(maxsize=16)
+def _build_devices_schema(
+    locks: tuple[tuple[str, str], ...], default: tuple[str, ...]
+) -> vol.Schema:
+    """Build the lock selection schema, reusing it for identical lock lists."""
+    # The schema is shared between flows, so hand each one a fresh default list.
+    return vol.Schema({
+        vol.Required(CONF_LOCKS, default=lambda: list(default)): cv.multi_select(
+            dict(locks)
+        )
+    })
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Kevo Plus."""
     VERSION = 1
@@ -44,32 +57,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         errors = {}
         try:
-            device_id = uuid.UUID(
-                bytes=hashlib.md5(user_input[CONF_PASSWORD].encode()).digest()
-            )
-
-            def create_api():
-                """Create API client with SSL context in executor."""
-                ssl_context = ssl.create_default_context()
-                return KevoApi(device_id, ssl_context=ssl_context)
-
-            self._api = await self.hass.async_add_executor_job(create_api)
-            # Offload the blocking login() call to the executor.
-            await self.hass.async_add_executor_job(
-                self._api.login, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
-            )
-            # Offload get_locks() to the executor.
-            locks = await self.hass.async_add_executor_job(self._api.get_locks)
+            device_id = derive_device_id(user_input[CONF_PASSWORD])
+            self._api = KevoApi(device_id, ssl_context=get_default_context())
+            async with asyncio.timeout(15):
+                await self._api.login(
+                    user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+                )
+                locks = await self._api.get_locks()
             self._locks = {lock.lock_id: lock.name for lock in locks}
             self.data = user_input
             return await self.async_step_devices()
         except KevoAuthError:
             errors["base"] = "invalid_auth"
-        except KevoError:
+        except (KevoError, httpx.HTTPError, TimeoutError):
             errors["base"] = "cannot_connect"
-        except Exception as ex:
-            _LOGGER.exception("Unexpected exception: %s", ex)
-            errors["base"] = "unknown"
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
@@ -79,11 +80,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(
                 step_id="devices",
-                data_schema=vol.Schema({
-                    vol.Required(
-                        CONF_LOCKS, default=list(self._locks)
-                    ): cv.multi_select(self._locks)
-                }),
+                data_schema=_build_devices_schema(
+                    tuple(self._locks.items()), tuple(self._locks)
+                ),
             )
 
         self.data.update(user_input)
@@ -122,13 +121,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         data = self.hass.data[DOMAIN][self.config_entry.entry_id]
         try:
-            locks = {dev.lock_id: dev.name for dev in await data.get_devices()}
+            locks = await data.get_lock_names()
         except KevoAuthError:
             return self.async_abort(reason="invalid_auth")
-        except KevoError:
+        except (KevoError, httpx.HTTPError, TimeoutError):
             return self.async_abort(reason="cannot_connect")
-        except Exception:
-            return self.async_abort(reason="unknown")
 
         default_locks = self.config_entry.options.get(CONF_LOCKS)
         if default_locks is None:
@@ -136,10 +133,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({
-                vol.Required(
-                    CONF_LOCKS,
-                    default=default_locks,
-                ): cv.multi_select(locks),
-            }),
+            data_schema=_build_devices_schema(
+                tuple(locks.items()), tuple(default_locks or ())
+            ),
         )
\ No newline at end of file
@@ -1,4 +1,9 @@
 """Constants for Kevo Plus integration."""
+from datetime import timedelta
+
 CONF_LOCKS = "locks"
 DOMAIN = "kevo_plus"
 MODEL = "Kevo"
+UPDATE_INTERVAL = timedelta(seconds=30)
+WEBSOCKET_UPDATE_INTERVAL = timedelta(minutes=10)
+REQUEST_REFRESH_DELAY = 0.35
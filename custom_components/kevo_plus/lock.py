@@ -32,19 +32,12 @@ class KevoLock(CoordinatorEntity, LockEntity):
         """Initialize the lock."""
         super().__init__(coordinator)
         self._lock = lock
+        self._lock_id = lock.lock_id
         self._attr_name = lock.name
         self._attr_unique_id = lock.lock_id
         self._attr_device_class = "lock"
-        self._is_locked = None
-
-    @property
-    def is_locked(self) -> bool | None:
-        """Return true if lock is locked."""
-        if self.coordinator.data:
-            for device in self.coordinator.data.values():
-                if device.lock_id == self._lock.lock_id:
-                    return device.is_locked
-        return self._is_locked
+        self._attr_is_locked = lock.is_locked
+        self._last_available = coordinator.last_update_success
 
     async def async_lock(self, **kwargs: Any) -> None:
         """Lock the device."""
@@ -52,12 +45,12 @@ class KevoLock(CoordinatorEntity, LockEntity):
             _LOGGER.debug("Locking %s", self.name)
             # Since lock() is a coroutine, we need to await it directly
             await self._lock.lock()
-            self._is_locked = True
+            self._attr_is_locked = True
             self.async_write_ha_state()
             await self.coordinator.async_request_refresh()
         except Exception as e:
             _LOGGER.error("Failed to lock %s: %s", self.name, str(e))
-            self._is_locked = None
+            self._attr_is_locked = None
             self.async_write_ha_state()
 
     async def async_unlock(self, **kwargs: Any) -> None:
@@ -66,21 +59,36 @@ class KevoLock(CoordinatorEntity, LockEntity):
             _LOGGER.debug("Unlocking %s", self.name)
             # Since unlock() is a coroutine, we need to await it directly
             await self._lock.unlock()
-            self._is_locked = False
+            self._attr_is_locked = False
             self.async_write_ha_state()
             await self.coordinator.async_request_refresh()
         except Exception as e:
             _LOGGER.error("Failed to unlock %s: %s", self.name, str(e))
-            self._is_locked = None
+            self._attr_is_locked = None
             self.async_write_ha_state()
 
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.register_for(self._lock_id, self._handle_coordinator_update)
+        )
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data:
-            for device in self.coordinator.data.values():
-                if device.lock_id == self._lock.lock_id:
-                    self._lock = device
-                    self._is_locked = device.is_locked
-                    break
+        data = self.coordinator.data
+        is_locked = self._attr_is_locked
+        if data:
+            device = data.get(self._lock_id)
+            if device is not None:
+                self._lock = device
+                is_locked = device.is_locked
+
+        # Skip the state write when neither the state nor availability changed.
+        available = self.available
+        if is_locked == self._attr_is_locked and available == self._last_available:
+            return
+        self._attr_is_locked = is_locked
+        self._last_available = available
         self.async_write_ha_state()
\ No newline at end of file
@@ -1,4 +1,9 @@
 """Support for Kevo Plus lock sensors."""
+import sys
+
+import httpx
+from custom_components.kevo_plus.aiokevoplus import KevoError
+
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE
@@ -11,20 +16,36 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import KevoCoordinator
 from .const import DOMAIN, MODEL
 
+_identifiers_cache: dict[str, frozenset[tuple[str, str]]] = {}
+
 async def async_setup_entry(hass: HomeAssistant, config: ConfigEntry, add_entities: AddEntitiesCallback) -> None:
     """Set up the sensor platform."""
     coordinator: KevoCoordinator = hass.data[DOMAIN][config.entry_id]
 
     try:
         devices = await coordinator.get_devices()
-    except Exception as ex:
+    except (KevoError, httpx.HTTPError, TimeoutError) as ex:
         raise PlatformNotReady("Error getting devices") from ex
 
+    device_info_by_id = {
+        lock.lock_id: DeviceInfo(
+            identifiers=_identifiers_cache.setdefault(
+                lock.lock_id, frozenset({(DOMAIN, lock.lock_id)})
+            ),
+            manufacturer=lock.brand,
+            name=lock.name,
+            model=MODEL,
+            sw_version=lock.firmware,
+        )
+        for lock in devices
+    }
+
     entities = [
         KevoSensorEntity(
             hass=hass,
             name="Battery Level",
             device=lock,
+            device_info=device_info_by_id[lock.lock_id],
             coordinator=coordinator,
             device_type="battery_level",
         )
@@ -41,38 +62,47 @@ class KevoSensorEntity(CoordinatorEntity, SensorEntity):
         hass: HomeAssistant,
         name: str,
         device,
+        device_info: DeviceInfo,
         coordinator: KevoCoordinator,
         device_type: str,
     ) -> None:
         super().__init__(coordinator)
         self._device = device
         self._device_type = device_type
+        self._last_available = coordinator.last_update_success
 
         self._attr_name = name
         self._attr_has_entity_name = True
         self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_unique_id = f"{device.lock_id}_{device_type}"
+        self._attr_unique_id = sys.intern(f"{device.lock_id}_{device_type}")
 
         if device_type == "battery_level":
             self._attr_device_class = SensorDeviceClass.BATTERY
             self._attr_native_value = device.battery_level
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device.lock_id)},
-            manufacturer=device.brand,
-            name=device.name,
-            model=MODEL,
-            sw_version=device.firmware,
-        )
+        self._attr_device_info = device_info
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        value = self._attr_native_value
         if self._device_type == "battery_level":
-            self._attr_native_value = self._device.battery_level
+            device = (self.coordinator.data or {}).get(self._device.lock_id)
+            value = device.battery_level if device is not None else None
+
+        # Skip the state write when neither the value nor availability changed.
+        available = self.available
+        if value == self._attr_native_value and available == self._last_available:
+            return
+        self._attr_native_value = value
+        self._last_available = available
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         await super().async_added_to_hass()
-        self.async_on_remove(self._device.api.register_callback(self._handle_coordinator_update))
\ No newline at end of file
+        self.async_on_remove(
+            self.coordinator.register_for(
+                self._device.lock_id, self._handle_coordinator_update
+            )
+        )